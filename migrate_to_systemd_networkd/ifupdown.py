@@ -1,6 +1,7 @@
 import argparse
 import ipaddress
 import os
+import sys
 import typing
 from collections import defaultdict
 
@@ -9,6 +10,7 @@ from migrate_to_systemd_networkd.utils import (
     ask_write_file,
     probe_systemd,
 )
+from migrate_to_systemd_networkd import verify
 
 
 class Converter:
@@ -39,6 +41,12 @@ class Converter:
         self.systemd_version = systemd_version
 
     def work(self):
+        self.setup()
+        if self.use_table_name:
+            self.convert_routes()
+        self.convert()
+
+    def setup(self):
         if self.systemd_version is None:
             self.systemd_version = probe_systemd()
         self.table_mapping = self.get_routes()
@@ -46,7 +54,6 @@ class Converter:
         # https://github.com/systemd/systemd/commit/c038ce4606f93d9e58147f87703125270fb744e2
         # use table names instead of raw numbers
         if int(self.systemd_version) >= 248:
-            self.convert_routes()
             self.use_table_name = True
         else:
             self.use_table_name = False
@@ -58,8 +65,6 @@ class Converter:
         else:
             self.disable_dhcpv6_client_on_ra = False
 
-        self.convert()
-
     def handle_iface(
         self,
         name: str,
@@ -341,16 +346,30 @@ class Converter:
             current_configs = defaultdict(list)
         return result
 
-    def convert(self):
-        print(
-            "Converting {} to systemd-networkd configs in {}".format(
-                self.interfaces, self.output
-            )
-        )
+    def generate(self):
         # filename -> dict
         result = AutoVivification()
         with open(self.interfaces, "r") as f:
             result = self.convert_file(f, result)
+        return result
+
+    def verify_snapshot(self, snapshot: str):
+        """Compare generated configs against a snapshot of current state,
+        without writing anything"""
+        print("Verifying {} against snapshot {}".format(self.interfaces, snapshot))
+        self.setup()
+        report = verify.verify(
+            self.generate(), verify.load_snapshot(snapshot), self.table_mapping
+        )
+        for kind in report:
+            for status in ("missing", "extra", "unverifiable"):
+                for key in report[kind][status]:
+                    print("{} {}: {}".format(status.capitalize(), kind, key))
+        return report
+
+    def render(self, result: AutoVivification):
+        """Render generated configs, returns filename -> content"""
+        files = {}
         for file in result:
             # configparse do not support repeated keys
             # let's do it ourselves
@@ -387,9 +406,20 @@ class Converter:
                             data += "{} = {}\n".format(key, value)
                     data += "\n"
 
+            files[file] = data
+        return files
+
+    def convert(self):
+        print(
+            "Converting {} to systemd-networkd configs in {}".format(
+                self.interfaces, self.output
+            )
+        )
+        files = self.render(self.generate())
+        for file in files:
             dest = os.path.join(self.output, file)
 
-            ask_write_file(dest, data)
+            ask_write_file(dest, files[file])
 
     def get_routes(self):
         """Collect custom table names from /etc/iproute2/rt_tables"""
@@ -412,9 +442,10 @@ class Converter:
                     result[table_name] = table_id
         return result
 
-    def convert_routes(self):
+    def render_routes(self):
+        """Render RouteTable= for networkd.conf, None if no custom tables"""
         if len(self.table_mapping) == 0:
-            return
+            return None
         data = "[Network]\n"
         data += "RouteTable="
         entries = []
@@ -422,6 +453,12 @@ class Converter:
             entries.append("{}:{}".format(name, self.table_mapping[name]))
         data += " ".join(entries)
         data += "\n"
+        return data
+
+    def convert_routes(self):
+        data = self.render_routes()
+        if data is None:
+            return
         ask_write_file(self.config, data)
 
 
@@ -455,11 +492,23 @@ def run():
     )
     parser.add_argument("--systemd-version", required=False,
                         help="systemd version")
+    parser.add_argument(
+        "--verify",
+        required=False,
+        help="path to json snapshot with keys addr, route, route6, rule and rule6 (see README), compare instead of writing configs",
+    )
     args = parser.parse_args()
 
     converter = Converter(
         args.interfaces, args.tables, args.output, args.config, args.systemd_version
     )
+    if args.verify is not None:
+        report = converter.verify_snapshot(args.verify)
+        for kind in report:
+            if report[kind]["missing"] or report[kind]["extra"]:
+                sys.exit(1)
+        print("Snapshot matches generated configs")
+        return
     converter.work()
 
 
@@ -0,0 +1,133 @@
+import argparse
+import functools
+import glob
+import os
+import sys
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from migrate_to_systemd_networkd.ifupdown import Converter
+
+# suffixes of committed golden files in each example folder
+GOLDEN_SUFFIXES = (".network", ".netdev")
+TABLES_CONF = "tables.conf"
+
+# examples folder of the source tree, independent of cwd
+EXAMPLES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples"
+)
+
+
+def render_example(folder: str, systemd_version: str):
+    """Convert folder/interfaces in-process, returns filename -> content"""
+    converter = Converter(
+        os.path.join(folder, "interfaces"),
+        os.path.join(folder, "rt_tables"),
+        folder,
+        os.path.join(folder, TABLES_CONF),
+        systemd_version,
+    )
+    converter.setup()
+    files = converter.render(converter.generate())
+    if converter.use_table_name:
+        routes = converter.render_routes()
+        if routes is not None:
+            files[TABLES_CONF] = routes
+    return files
+
+
+def check_example(folder: str, systemd_version: str):
+    """Convert folder/interfaces in-process and compare with committed files
+
+    Returns (folder, mismatched filenames, error or None, elapsed seconds)"""
+    start = time.perf_counter()
+    try:
+        files = render_example(folder, systemd_version)
+    except Exception as e:
+        # a crashing converter fails this example only
+        error = "{}: {}".format(type(e).__name__, e)
+        return folder, [], error, time.perf_counter() - start
+
+    mismatches = []
+    for file in sorted(files):
+        dest = os.path.join(folder, file)
+        if not os.path.exists(dest):
+            mismatches.append(file)
+            continue
+        with open(dest, "rb") as f:
+            if f.read() != files[file].encode("utf-8"):
+                mismatches.append(file)
+
+    # committed files that are no longer generated
+    for file in sorted(os.listdir(folder)):
+        if file in files:
+            continue
+        if file.endswith(GOLDEN_SUFFIXES) or file == TABLES_CONF:
+            mismatches.append(file)
+
+    return folder, mismatches, None, time.perf_counter() - start
+
+
+def check_examples(
+    examples: str, systemd_version: str, jobs: typing.Optional[int] = None
+):
+    """Check every examples/*/interfaces in parallel processes, sorted by
+    folder"""
+    folders = sorted(
+        os.path.dirname(path)
+        for path in glob.glob(os.path.join(examples, "*", "interfaces"))
+    )
+    if len(folders) == 0:
+        return []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(
+            executor.map(
+                functools.partial(check_example, systemd_version=systemd_version),
+                folders,
+            )
+        )
+
+
+def run():
+    parser = argparse.ArgumentParser(
+        description="Check ifupdown-to-systemd-networkd against golden files in examples"
+    )
+    parser.add_argument(
+        "--examples",
+        required=False,
+        help="path to examples folder, default to examples in the source tree",
+        default=EXAMPLES,
+    )
+    parser.add_argument(
+        "--systemd-version",
+        required=False,
+        help="systemd version, default to 248",
+        default="248",
+    )
+    parser.add_argument(
+        "--jobs", required=False, type=int, help="number of parallel processes"
+    )
+    args = parser.parse_args()
+
+    results = check_examples(args.examples, args.systemd_version, args.jobs)
+    if len(results) == 0:
+        print("No examples found in {}".format(args.examples))
+        sys.exit(1)
+    failed = 0
+    for folder, mismatches, error, elapsed in results:
+        status = "FAIL" if mismatches or error else "OK"
+        print("{} {} ({:.2f} ms)".format(status, folder, elapsed * 1000))
+        if error is not None:
+            print("  Error {}".format(error))
+        for file in mismatches:
+            print("  Mismatch {}".format(os.path.join(folder, file)))
+        if mismatches or error:
+            failed += 1
+    print("{} examples, {} failed".format(len(results), failed))
+    if failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,223 @@
+import ipaddress
+import json
+import typing
+
+from migrate_to_systemd_networkd.utils import AutoVivification
+
+# https://man7.org/linux/man-pages/man8/ip-route.8.html
+# reserved table names, always known to iproute2
+BUILTIN_TABLES = {"default": "253", "main": "254", "local": "255"}
+
+# routes installed by the kernel or a dynamic protocol, not by configs
+DYNAMIC_PROTOCOLS = ("kernel", "dhcp", "ra", "redirect")
+
+# ip prints default for both families
+DEFAULT_PREFIX = {"inet": "0.0.0.0/0", "inet6": "::/0"}
+
+# rules that exist on every host
+DEFAULT_RULES = (
+    (0, "local"),
+    (32766, "main"),
+    (32767, "default"),
+)
+
+
+def load_snapshot(path: str):
+    """Load a snapshot of `ip -j addr`, `ip -j route show table all`,
+    `ip -6 -j route show table all`, `ip -j rule` and `ip -6 -j rule` saved
+    as a json object with keys addr, route, route6, rule and rule6"""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def normalize_table(table, table_mapping: typing.Dict[str, str]) -> str:
+    if table is None:
+        return BUILTIN_TABLES["main"]
+    table = str(table)
+    if table in BUILTIN_TABLES:
+        return BUILTIN_TABLES[table]
+    if table in table_mapping:
+        return str(table_mapping[table])
+    return table
+
+
+def normalize_prefix(prefix: str, family: str = "inet") -> str:
+    if prefix == "default":
+        prefix = DEFAULT_PREFIX[family]
+    return str(ipaddress.ip_network(prefix, strict=False))
+
+
+def normalize_gateway(gateway: typing.Optional[str]) -> typing.Optional[str]:
+    if gateway is None:
+        return None
+    return str(ipaddress.ip_address(gateway))
+
+
+def normalize_address(address: str) -> str:
+    return str(ipaddress.ip_interface(address))
+
+
+def index_addresses(addr: typing.List[dict], links: typing.Set[str]):
+    """Index `ip -j addr` by (link, prefix)"""
+    index = {}
+    for link in addr:
+        name = link.get("ifname")
+        if name not in links:
+            continue
+        for info in link.get("addr_info", []):
+            if info.get("family") not in ("inet", "inet6"):
+                continue
+            # skip loopback, link local and addresses from dhcp/slaac
+            if info.get("scope") in ("host", "link") or info.get("dynamic"):
+                continue
+            address = normalize_address(
+                "{}/{}".format(info["local"], info["prefixlen"])
+            )
+            index[(name, address)] = info
+    return index
+
+
+def index_routes(
+    route: typing.List[dict],
+    family: str,
+    links: typing.Set[str],
+    table_mapping: typing.Dict[str, str],
+):
+    """Index `ip -j route show table all` by (destination, gateway, table)"""
+    index = {}
+    for entry in route:
+        if entry.get("dev") not in links:
+            continue
+        if entry.get("type", "unicast") != "unicast":
+            continue
+        if entry.get("protocol") in DYNAMIC_PROTOCOLS:
+            continue
+        table = normalize_table(entry.get("table"), table_mapping)
+        if table == BUILTIN_TABLES["local"]:
+            continue
+        gateway = normalize_gateway(entry.get("gateway"))
+        destination = normalize_prefix(entry["dst"], family)
+        index[(destination, gateway, table)] = entry
+    return index
+
+
+def index_rules(
+    rule: typing.List[dict], family: str, table_mapping: typing.Dict[str, str]
+):
+    """Index `ip -j rule` by (from, table), from all becomes the default
+    prefix of the family"""
+    index = {}
+    for entry in rule:
+        # unreachable, prohibit, blackhole and goto rules have no table
+        if "table" not in entry:
+            continue
+        if (entry.get("priority"), entry.get("table")) in DEFAULT_RULES:
+            continue
+        rule_from = entry.get("src", "all")
+        if rule_from == "all":
+            rule_from = "default"
+        elif "srclen" in entry:
+            rule_from = "{}/{}".format(rule_from, entry["srclen"])
+        rule_from = normalize_prefix(rule_from, family)
+        table = normalize_table(entry["table"], table_mapping)
+        index[(rule_from, table)] = entry
+    return index
+
+
+def gateway_family(gateway: typing.Optional[str]) -> str:
+    if gateway is not None and ":" in gateway:
+        return "inet6"
+    return "inet"
+
+
+def index_result(result: AutoVivification, table_mapping: typing.Dict[str, str]):
+    """Index generated configs the same way as the snapshot"""
+    links = set()
+    addresses = {}
+    routes = {}
+    rules = {}
+    # routes the converter emitted but cannot be parsed, e.g. blackhole
+    unverifiable = []
+    for file in result:
+        if not file.endswith(".network"):
+            continue
+        network = result[file]
+        name = network["Match"]["Name"]
+        links.add(name)
+
+        if "Address" in network:
+            for address_config in network["Address"]:
+                address = normalize_address(address_config["Address"])
+                addresses[(name, address)] = address_config
+
+        if "Network" in network and "Gateway" in network["Network"]:
+            for gateway in network["Network"]["Gateway"]:
+                gateway = normalize_gateway(gateway)
+                destination = normalize_prefix("default", gateway_family(gateway))
+                key = (destination, gateway, BUILTIN_TABLES["main"])
+                routes[key] = {"Destination": destination, "Gateway": gateway}
+
+        if "Route" in network:
+            for route in network["Route"]:
+                try:
+                    gateway = normalize_gateway(route.get("Gateway"))
+                    destination = normalize_prefix(
+                        route["Destination"], gateway_family(gateway)
+                    )
+                except ValueError:
+                    unverifiable.append(route)
+                    continue
+                table = normalize_table(route.get("Table"), table_mapping)
+                routes[(destination, gateway, table)] = route
+
+        if "RoutingPolicyRule" in network:
+            for rule in network["RoutingPolicyRule"]:
+                rule_from = rule.get("From", "all")
+                if rule_from == "all":
+                    rule_from = normalize_prefix("default", "inet")
+                else:
+                    rule_from = normalize_prefix(rule_from)
+                table = normalize_table(rule.get("Table"), table_mapping)
+                rules[(rule_from, table)] = rule
+    return links, addresses, routes, rules, unverifiable
+
+
+def diff_index(expected: dict, actual: dict):
+    # gateway may be None, sort by string form
+    missing = sorted((key for key in expected if key not in actual), key=str)
+    extra = sorted((key for key in actual if key not in expected), key=str)
+    return {"missing": missing, "extra": extra}
+
+
+def verify(
+    result: AutoVivification, snapshot: dict, table_mapping: typing.Dict[str, str]
+):
+    """Compare generated configs against a snapshot of current state
+
+    Returns missing (generated but not in snapshot) and extra (in snapshot
+    but not generated) keys for addresses, routes and rules, and generated
+    entries that cannot be compared as unverifiable"""
+    links, addresses, routes, rules, unverifiable = index_result(
+        result, table_mapping
+    )
+    snapshot_routes = index_routes(
+        snapshot.get("route", []), "inet", links, table_mapping
+    )
+    snapshot_routes.update(
+        index_routes(snapshot.get("route6", []), "inet6", links, table_mapping)
+    )
+    snapshot_rules = index_rules(snapshot.get("rule", []), "inet", table_mapping)
+    snapshot_rules.update(
+        index_rules(snapshot.get("rule6", []), "inet6", table_mapping)
+    )
+    report = {
+        "Address": diff_index(
+            addresses, index_addresses(snapshot.get("addr", []), links)
+        ),
+        "Route": diff_index(routes, snapshot_routes),
+        "RoutingPolicyRule": diff_index(rules, snapshot_rules),
+    }
+    for kind in report:
+        report[kind]["unverifiable"] = []
+    report["Route"]["unverifiable"] = unverifiable
+    return report
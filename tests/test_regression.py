@@ -0,0 +1,50 @@
+import os
+import shutil
+
+from migrate_to_systemd_networkd import regression
+
+examples = os.path.join(os.path.dirname(__file__), "..", "examples")
+
+
+def test_examples():
+    results = regression.check_examples(examples, "248")
+    assert len(results) > 0
+    for folder, mismatches, error, elapsed in results:
+        assert mismatches == [], folder
+        assert error is None, folder
+
+
+def test_mismatch(tmp_path):
+    folder = str(tmp_path / "post-up")
+    shutil.copytree(os.path.join(examples, "post-up"), folder)
+    with open(os.path.join(folder, "eth0.network"), "a") as f:
+        f.write("\n")
+    with open(os.path.join(folder, "tables.conf"), "a") as f:
+        f.write("\n")
+    # committed but no longer generated
+    with open(os.path.join(folder, "foo.network"), "w") as f:
+        f.write("")
+
+    results = regression.check_examples(str(tmp_path), "248")
+    assert results[0][1] == ["eth0.network", "tables.conf", "foo.network"]
+    assert results[0][2] is None
+
+
+def test_error(tmp_path):
+    shutil.copytree(os.path.join(examples, "post-up"), str(tmp_path / "post-up"))
+    folder = tmp_path / "broken"
+    folder.mkdir()
+    # blank line inside an iface stanza crashes the parser
+    (folder / "interfaces").write_text("auto eth0\niface eth0 inet dhcp\n\n")
+
+    results = regression.check_examples(str(tmp_path), "248")
+    folder, mismatches, error, elapsed = results[0]
+    assert folder.endswith("broken")
+    assert error.startswith("IndexError")
+    folder, mismatches, error, elapsed = results[1]
+    assert mismatches == []
+    assert error is None
+
+
+def test_no_examples(tmp_path):
+    assert regression.check_examples(str(tmp_path), "248") == []
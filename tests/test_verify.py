@@ -0,0 +1,221 @@
+import io
+
+from migrate_to_systemd_networkd import ifupdown as convert
+from migrate_to_systemd_networkd import verify
+
+
+def create_result(config):
+    f = io.StringIO(config)
+    converter = convert.Converter("", "", "", "", 248)
+    return converter.convert_file(f, convert.AutoVivification())
+
+
+config = """auto eth0
+iface eth0 inet static
+    address 192.168.0.100/24
+    gateway 192.168.0.1
+    post-up ip route add 10.0.0.0/8 via 192.168.0.2 table some_table
+    post-up ip rule add from 192.168.0.100 table some_table
+iface eth0 inet6 static
+    address fec0:0:0:1::2/64
+"""
+
+snapshot = {
+    "addr": [
+        {
+            "ifname": "lo",
+            "addr_info": [{"family": "inet", "local": "127.0.0.1", "prefixlen": 8}],
+        },
+        {
+            "ifname": "eth0",
+            "addr_info": [
+                {"family": "inet", "local": "192.168.0.100", "prefixlen": 24},
+                {"family": "inet6", "local": "fec0::1:0:0:0:2", "prefixlen": 64},
+                {
+                    "family": "inet6",
+                    "local": "fe80::1",
+                    "prefixlen": 64,
+                    "scope": "link",
+                },
+            ],
+        },
+    ],
+    "route": [
+        {"dst": "default", "gateway": "192.168.0.1", "dev": "eth0"},
+        {
+            "dst": "192.168.0.0/24",
+            "dev": "eth0",
+            "protocol": "kernel",
+            "scope": "link",
+        },
+        {
+            "dst": "10.0.0.0/8",
+            "gateway": "192.168.0.2",
+            "dev": "eth0",
+            "table": "100",
+        },
+        {"type": "local", "dst": "192.168.0.100", "table": "local"},
+    ],
+    "rule": [
+        {"priority": 0, "src": "all", "table": "local"},
+        {"priority": 32765, "src": "192.168.0.100", "table": "some_table"},
+        {"priority": 32766, "src": "all", "table": "main"},
+        {"priority": 32767, "src": "all", "table": "default"},
+    ],
+}
+
+
+def test_verify_match():
+    result = create_result(config)
+    report = verify.verify(result, snapshot, {"some_table": "100"})
+    for kind in report:
+        assert report[kind]["missing"] == []
+        assert report[kind]["extra"] == []
+
+
+def test_verify_missing_and_extra():
+    result = create_result(config)
+    changed = {
+        "addr": [
+            {
+                "ifname": "eth0",
+                "addr_info": [
+                    {"family": "inet", "local": "192.168.0.101", "prefixlen": 24},
+                    {"family": "inet6", "local": "fec0:0:0:1::2", "prefixlen": 64},
+                ],
+            },
+        ],
+        "route": [
+            {"dst": "default", "gateway": "192.168.0.254", "dev": "eth0"},
+            {
+                "dst": "10.0.0.0/8",
+                "gateway": "192.168.0.2",
+                "dev": "eth0",
+                "table": "some_table",
+            },
+        ],
+        "rule": [],
+    }
+    report = verify.verify(result, changed, {"some_table": "100"})
+    assert report["Address"]["missing"] == [("eth0", "192.168.0.100/24")]
+    assert report["Address"]["extra"] == [("eth0", "192.168.0.101/24")]
+    assert report["Route"]["missing"] == [("0.0.0.0/0", "192.168.0.1", "254")]
+    assert report["Route"]["extra"] == [("0.0.0.0/0", "192.168.0.254", "254")]
+    assert report["RoutingPolicyRule"]["missing"] == [("192.168.0.100/32", "100")]
+    assert report["RoutingPolicyRule"]["extra"] == []
+
+
+def test_verify_dual_stack():
+    result = create_result(
+        """auto eth1
+iface eth1 inet static
+    address 192.168.1.2/24
+    gateway 192.168.1.1
+iface eth1 inet6 static
+    address fec0:0:0:1::2/64
+    gateway fec0:0:0:1:0:0:0:1
+"""
+    )
+    dual_stack = {
+        "addr": [
+            {
+                "ifname": "eth1",
+                "addr_info": [
+                    {"family": "inet", "local": "192.168.1.2", "prefixlen": 24},
+                    {"family": "inet6", "local": "fec0:0:0:1::2", "prefixlen": 64},
+                ],
+            },
+        ],
+        "route": [
+            {"dst": "default", "gateway": "192.168.1.1", "dev": "eth1"},
+            # routes on links not managed by the configs
+            {"dst": "172.17.0.0/16", "dev": "docker0", "protocol": "static"},
+            {"dst": "default", "gateway": "172.17.0.1", "dev": "docker0"},
+        ],
+        "route6": [
+            {"dst": "default", "gateway": "fec0:0:0:1::1", "dev": "eth1"},
+        ],
+        "rule": [
+            {"priority": 0, "src": "all", "table": "local"},
+            {"priority": 100, "src": "all", "action": "unreachable"},
+            {"priority": 32766, "src": "all", "table": "main"},
+        ],
+        "rule6": [
+            {"priority": 0, "src": "all", "table": "local"},
+            {"priority": 32766, "src": "all", "table": "main"},
+        ],
+    }
+    report = verify.verify(result, dual_stack, {})
+    for kind in report:
+        assert report[kind]["missing"] == []
+        assert report[kind]["extra"] == []
+
+    del dual_stack["route6"]
+    report = verify.verify(result, dual_stack, {})
+    assert report["Route"]["missing"] == [("::/0", "fec0:0:0:1::1", "254")]
+
+
+def test_verify_loopback():
+    result = create_result(
+        """auto lo
+iface lo inet loopback
+"""
+    )
+    loopback = {
+        "addr": [
+            {
+                "ifname": "lo",
+                "addr_info": [
+                    {
+                        "family": "inet",
+                        "local": "127.0.0.1",
+                        "prefixlen": 8,
+                        "scope": "host",
+                    },
+                    {
+                        "family": "inet6",
+                        "local": "::1",
+                        "prefixlen": 128,
+                        "scope": "host",
+                    },
+                ],
+            },
+        ],
+    }
+    report = verify.verify(result, loopback, {})
+    assert report["Address"]["missing"] == []
+    assert report["Address"]["extra"] == []
+
+
+def test_verify_rule_family():
+    result = create_result(
+        """auto eth0
+iface eth0 inet static
+    post-up ip rule add from all table some_table
+"""
+    )
+    only_rule6 = {
+        "rule6": [{"priority": 100, "src": "all", "table": "some_table"}],
+    }
+    report = verify.verify(result, only_rule6, {"some_table": "100"})
+    assert report["RoutingPolicyRule"]["missing"] == [("0.0.0.0/0", "100")]
+    assert report["RoutingPolicyRule"]["extra"] == [("::/0", "100")]
+
+    only_rule = {
+        "rule": [{"priority": 100, "src": "all", "table": "some_table"}],
+    }
+    report = verify.verify(result, only_rule, {"some_table": "100"})
+    assert report["RoutingPolicyRule"]["missing"] == []
+    assert report["RoutingPolicyRule"]["extra"] == []
+
+
+def test_verify_unverifiable_route():
+    result = create_result(
+        """auto eth0
+iface eth0 inet static
+    post-up ip route add blackhole 10.0.0.0/8
+"""
+    )
+    report = verify.verify(result, {}, {})
+    assert report["Route"]["missing"] == []
+    assert report["Route"]["unverifiable"] == [{"Destination": "blackhole"}]